@@ -10,103 +10,140 @@ import time
 import os
 import json
 import hashlib
-from datetime import datetime
+import threading
+from types import MappingProxyType
 
-# Device type detection from build flags
-def get_device_type():
-    build_flags = env.ParseFlags(env.get("BUILD_FLAGS", ""))
-    defines = build_flags.get("CPPDEFINES", [])
-    
-    for define in defines:
-        if isinstance(define, tuple):
-            name, value = define
-        else:
-            name, value = define, None
-            
-        if name == "DEVICE_TYPE_ENVIRONMENTAL":
-            return "environmental"
-        elif name == "DEVICE_TYPE_LIQUID":
-            return "liquid"
-    
-    return "unknown"
+# Device-specific information
+_DEVICE_INFO = MappingProxyType({
+    "environmental": {
+        "name": "AeroEnv",
+        "full_name": "AeroEnv Environmental Controller", 
+        "sensors": ["temperature", "humidity", "pressure"],
+        "actuators": ["lights", "spray", "fan"]
+    },
+    "liquid": {
+        "name": "AeroLiquid",
+        "full_name": "AeroLiquid Chemical Controller",
+        "sensors": ["ph", "ec", "water_temp"],
+        "actuators": ["pumps", "valves", "circulation"]
+    },
+    "unknown": {
+        "name": "Unknown",
+        "full_name": "Unknown Device",
+        "sensors": [],
+        "actuators": []
+    }
+})
 
-# Build information generation
-def generate_build_info(source, target, env):
-    """Generate build information header with device-specific content"""
-    
-    device_type = get_device_type()
-    build_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    build_timestamp = int(time.time())
-    
-    # Get git information if available
-    git_hash = "unknown"
-    git_branch = "unknown"
-    git_dirty = False
-    
-    try:
-        import subprocess
-        git_hash = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD']).decode('ascii').strip()
-        git_branch = subprocess.check_output(['git', 'rev-parse', '--abbrev-ref', 'HEAD']).decode('ascii').strip()
-        
-        # Check if repository is dirty
-        try:
-            subprocess.check_output(['git', 'diff-index', '--quiet', 'HEAD'])
-        except subprocess.CalledProcessError:
-            git_dirty = True
-            
-    except Exception as e:
-        print(f"Warning: Could not get git information: {e}")
-    
-    # Device-specific information
-    device_info = {
-        "environmental": {
-            "name": "AeroEnv",
-            "full_name": "AeroEnv Environmental Controller", 
-            "sensors": ["temperature", "humidity", "pressure"],
-            "actuators": ["lights", "spray", "fan"]
+# Device-specific configuration templates
+_CONFIG_TEMPLATES = MappingProxyType({
+    "environmental": {
+        "device": {
+            "type": "environmental",
+            "name": "AeroEnv Controller",
+            "version": "1.0.0"
         },
-        "liquid": {
-            "name": "AeroLiquid",
-            "full_name": "AeroLiquid Chemical Controller",
-            "sensors": ["ph", "ec", "water_temp"],
-            "actuators": ["pumps", "valves", "circulation"]
+        "sensors": [
+            {
+                "name": "sht3x",
+                "type": "SHT3x", 
+                "i2c_address": "0x44",
+                "enabled": True
+            },
+            {
+                "name": "pressure",
+                "type": "AnalogPressure",
+                "pin": 36,
+                "enabled": True
+            }
+        ],
+        "actuators": [
+            {
+                "name": "lights",
+                "type": "Relay",
+                "pin": 23,
+                "enabled": True
+            },
+            {
+                "name": "spray",
+                "type": "VenturiNozzle", 
+                "pin": 22,
+                "enabled": True,
+                "pulse_width_ms": 5000
+            }
+        ]
+    },
+    "liquid": {
+        "device": {
+            "type": "liquid",
+            "name": "AeroLiquid Controller",
+            "version": "1.0.0"
         },
-        "unknown": {
-            "name": "Unknown",
-            "full_name": "Unknown Device",
-            "sensors": [],
-            "actuators": []
-        }
+        "sensors": [
+            {
+                "name": "ph_sensor",
+                "type": "AnalogPH",
+                "pin": 36,
+                "enabled": True
+            },
+            {
+                "name": "ec_sensor", 
+                "type": "AnalogEC",
+                "pin": 39,
+                "enabled": True
+            }
+        ],
+        "actuators": [
+            {
+                "name": "ph_up_pump",
+                "type": "PeristalticPump",
+                "pin": 23,
+                "enabled": True
+            },
+            {
+                "name": "nutrient_pump",
+                "type": "PeristalticPump", 
+                "pin": 22,
+                "enabled": True
+            }
+        ]
     }
-    
-    device = device_info.get(device_type, device_info["unknown"])
-    
-    # Create build info header
-    build_info_content = f"""#ifndef BUILD_INFO_H
+})
+
+# JSON output format shared by all generated files
+_JSON_OPTIONS = {"indent": 2, "ensure_ascii": False, "separators": (",", ": ")}
+
+# Templates are static, so serialize them once
+_CONFIG_TEMPLATE_JSON = {
+    device_type: json.dumps(template, **_JSON_OPTIONS)
+    for device_type, template in _CONFIG_TEMPLATES.items()
+}
+
+# build_info.h blocks; only the preamble has per-build fields
+_HEADER_PREAMBLE_TMPL = """#ifndef BUILD_INFO_H
 #define BUILD_INFO_H
 
 // Build information
 #define BUILD_TIME "{build_time}"
 #define BUILD_TIMESTAMP {build_timestamp}
-#define BUILD_GIT_HASH "{git_hash}{'*' if git_dirty else ''}"
+#define BUILD_GIT_HASH "{git_hash}{git_dirty_suffix}"
 #define BUILD_GIT_BRANCH "{git_branch}"
-#define BUILD_GIT_DIRTY {"1" if git_dirty else "0"}
+#define BUILD_GIT_DIRTY {git_dirty_flag}
 
 // Firmware information
 #define FIRMWARE_VERSION "1.0.0"
-#define FIRMWARE_BUILD_TYPE "{env.get('BUILD_TYPE', 'debug').upper()}"
+#define FIRMWARE_BUILD_TYPE "{build_type}"
 
 // Device information
 #define DEVICE_TYPE "{device_type}"
-#define DEVICE_NAME "{device['name']}"
-#define DEVICE_FULL_NAME "{device['full_name']}"
+#define DEVICE_NAME "{device_name}"
+#define DEVICE_FULL_NAME "{device_full_name}"
 
 // Feature flags based on device type
 """
 
-    # Add device-specific feature flags
-    if device_type == "environmental":
-        build_info_content += """
+_HEADER_FEATURES = MappingProxyType({
+    "environmental": """
 // Environmental device features
 #define HAS_TEMPERATURE_SENSOR 1
 #define HAS_HUMIDITY_SENSOR 1
@@ -116,9 +153,8 @@ def generate_build_info(source, target, env):
 #define HAS_FAN_CONTROL 1
 #define MAX_SENSORS 8
 #define MAX_ACTUATORS 6
-"""
-    elif device_type == "liquid":
-        build_info_content += """
+""",
+    "liquid": """
 // Liquid device features  
 #define HAS_PH_SENSOR 1
 #define HAS_EC_SENSOR 1
@@ -129,8 +165,9 @@ def generate_build_info(source, target, env):
 #define MAX_SENSORS 6
 #define MAX_ACTUATORS 12
 """
-    
-    build_info_content += """
+})
+
+_HEADER_TAIL = """
 // Build environment
 #define BUILD_PLATFORM "PlatformIO"
 #define BUILD_COMPILER_VERSION __VERSION__
@@ -141,18 +178,268 @@ def generate_build_info(source, target, env):
 
 #endif // BUILD_INFO_H
 """
+
+# Git information, collected once per build
+def _read_git_head(git_dir=".git"):
+    """Read HEAD commit hash and branch directly from the git directory"""
+    
+    try:
+        with open(os.path.join(git_dir, "HEAD"), "r") as f:
+            head = f.read().strip()
+        
+        # Detached HEAD holds the commit hash itself
+        if not head.startswith("ref: "):
+            return head, "HEAD"
+        
+        ref = head[len("ref: "):]
+        branch = ref[len("refs/heads/"):] if ref.startswith("refs/heads/") else ref
+        
+        try:
+            with open(os.path.join(git_dir, ref), "r") as f:
+                return f.read().strip(), branch
+        except FileNotFoundError:
+            pass
+        
+        # Ref may only exist in packed-refs after git gc
+        with open(os.path.join(git_dir, "packed-refs"), "r") as f:
+            for line in f:
+                if line.startswith(("#", "^")):
+                    continue
+                parts = line.split()
+                if len(parts) == 2 and parts[1] == ref:
+                    return parts[0], branch
+    except OSError:
+        # No .git directory (worktree, submodule, subdirectory project)
+        pass
+    
+    return None
+
+def _collect_git_info():
+    git_info = {
+        "hash": "unknown",
+        "branch": "unknown",
+        "dirty": False
+    }
+    
+    try:
+        import subprocess
+        
+        # Reading .git directly avoids spawning git in the common case
+        head = _read_git_head()
+        if head is not None:
+            full_hash, branch = head
+        else:
+            # rev-parse accepts several revisions at once: full hash, then branch name
+            result = subprocess.run(['git', 'rev-parse', 'HEAD', '--abbrev-ref', 'HEAD'],
+                                    stdin=subprocess.DEVNULL, capture_output=True, check=True)
+            full_hash, branch = result.stdout.decode('ascii', 'replace').split()
+        
+        git_info["hash"] = full_hash[:7]
+        git_info["branch"] = branch
+        
+        # Check if repository is dirty (non-zero exit means uncommitted changes)
+        result = subprocess.run(['git', 'diff-index', '--quiet', 'HEAD'],
+                                stdin=subprocess.DEVNULL, capture_output=True, check=False)
+        git_info["dirty"] = result.returncode != 0
+            
+    except Exception as e:
+        print(f"Warning: Could not get git information: {e}")
+    
+    return git_info
+
+_GIT_INFO = _collect_git_info()
+
+# Content-hash cache for generated files
+def _hash_file_for(path):
+    directory, name = os.path.split(path)
+    return os.path.join(directory, f".{name}.sha")
+
+def _atomic_write_bytes(path, data):
+    """Write data with a single write() to a temp file, then rename over path"""
+    
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
+def _write_if_changed(path, content, stable_content=None):
+    """Write generated file unless its content (or stable part) is unchanged"""
+    
+    data = content if isinstance(content, bytes) else content.encode("utf-8")
+    
+    # Fully stable content is compared against the file itself
+    if stable_content is None:
+        try:
+            with open(path, "rb") as f:
+                if f.read() == data:
+                    return False
+        except FileNotFoundError:
+            pass
+        
+        _atomic_write_bytes(path, data)
+        return True
+    
+    # Content with volatile parts is compared via a hash sidecar
+    digest = hashlib.sha256(stable_content.encode()).hexdigest()
+    hash_path = _hash_file_for(path)
+    
+    if os.path.exists(path) and os.path.exists(hash_path):
+        with open(hash_path, "r") as f:
+            if f.read().strip() == digest:
+                return False
+    
+    _atomic_write_bytes(path, data)
+    _atomic_write_bytes(hash_path, digest.encode("ascii"))
+    
+    return True
+
+# Output directories already created during this session
+_CREATED_DIRS = set()
+
+def _ensure_dirs(paths):
+    """Create output directories, skipping ones already created this session"""
+    for path in paths:
+        if path not in _CREATED_DIRS:
+            os.makedirs(path, exist_ok=True)
+            _CREATED_DIRS.add(path)
+
+# Pre-build steps run concurrently, so each step's output is printed as one block
+_LOG_LOCK = threading.Lock()
+
+def _log(*lines):
+    """Print lines together without interleaving with other build steps"""
+    with _LOG_LOCK:
+        print("\n".join(lines), flush=True)
+
+# Device type detection from build flags (cannot change within a build).
+# Builds without a DEVICE_TYPE_* define are treated as environmental.
+_DEVICE_TYPE_CACHE = None
+
+def get_device_type():
+    global _DEVICE_TYPE_CACHE
+    if _DEVICE_TYPE_CACHE is not None:
+        return _DEVICE_TYPE_CACHE
+    
+    build_flags = env.ParseFlags(env.get("BUILD_FLAGS", ""))
+    defines = build_flags.get("CPPDEFINES", [])
+    
+    device_type = "environmental"
+    for define in defines:
+        if isinstance(define, tuple):
+            name, value = define
+        else:
+            name, value = define, None
+            
+        if name == "DEVICE_TYPE_ENVIRONMENTAL":
+            device_type = "environmental"
+            break
+        elif name == "DEVICE_TYPE_LIQUID":
+            device_type = "liquid"
+            break
     
-    # Write build info header
-    os.makedirs("include", exist_ok=True)
-    with open("include/build_info.h", "w") as f:
-        f.write(build_info_content)
+    _DEVICE_TYPE_CACHE = device_type
+    return device_type
+
+# Shared state for the pre-build hooks, derived once per build
+class _Context:
+    def __init__(self, env):
+        self.env = env
+        self.device_type = get_device_type()
+        self.build_type = env.get('BUILD_TYPE', 'debug')
+        
+        # Read the clock once and derive every build time representation from it
+        now = time.time()
+        self.build_timestamp = int(now)
+        self.build_time = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+        
+        self.git_info = _GIT_INFO
+        self.device = _DEVICE_INFO.get(self.device_type, _DEVICE_INFO["unknown"])
+
+# Build information generation
+def generate_build_info(ctx):
+    """Generate build information header with device-specific content"""
+    
+    device_type = ctx.device_type
+    device = ctx.device
+    build_time = ctx.build_time
+    build_timestamp = ctx.build_timestamp
+    
+    git_hash = ctx.git_info["hash"]
+    git_branch = ctx.git_info["branch"]
+    git_dirty = ctx.git_info["dirty"]
+    dirty_suffix = "*" if git_dirty else ""
+    dirty_flag = "1" if git_dirty else "0"
+    
+    # Assemble build info header from the pre-rendered blocks
+    build_info_content = "".join((
+        _HEADER_PREAMBLE_TMPL.format(
+            build_time=build_time,
+            build_timestamp=build_timestamp,
+            git_hash=git_hash,
+            git_dirty_suffix=dirty_suffix,
+            git_branch=git_branch,
+            git_dirty_flag=dirty_flag,
+            build_type=ctx.build_type.upper(),
+            device_type=device_type,
+            device_name=device['name'],
+            device_full_name=device['full_name']
+        ),
+        _HEADER_FEATURES.get(device_type, ""),
+        _HEADER_TAIL
+    ))
+    
+    # Build time always changes, so leave it out of the content hash
+    stable_content = "".join(
+        line for line in build_info_content.splitlines(keepends=True)
+        if not line.startswith(("#define BUILD_TIME ", "#define BUILD_TIMESTAMP "))
+    )
+    
+    # Write build info header only when it changed, to avoid needless recompiles
+    if _write_if_changed("include/build_info.h", build_info_content, stable_content):
+        _log(f"✓ Generated build info for {device['name']}: {build_time} ({git_branch}:{git_hash})")
+    else:
+        _log(f"✓ Build info unchanged for {device['name']} ({git_branch}:{git_hash})")
+
+def _list_dir(path):
+    """Return the set of entry names in a directory, empty if it is missing"""
+    try:
+        with os.scandir(path) as entries:
+            return {entry.name for entry in entries}
+    except OSError:
+        return set()
+
+# Written after a validation run without warnings
+_VALIDATION_STAMP = "include/.validation_stamp"
+
+def _validation_is_current(device_type, watched_paths):
+    """Check whether the last clean validation is newer than all watched paths"""
+    try:
+        stamp_mtime = os.path.getmtime(_VALIDATION_STAMP)
+        with open(_VALIDATION_STAMP, "r") as f:
+            if f.read().strip() != device_type:
+                return False
+    except OSError:
+        return False
+    
+    for path in watched_paths:
+        try:
+            if os.path.getmtime(path) > stamp_mtime:
+                return False
+        except OSError:
+            # Removing a watched path also updates its parent directory's mtime
+            pass
     
-    print(f"✓ Generated build info for {device['name']}: {build_time} ({git_branch}:{git_hash})")
+    return True
 
-def validate_project_structure(source, target, env):
+def validate_project_structure(ctx):
     """Validate project structure and configuration"""
     
-    device_type = get_device_type()
+    device_type = ctx.device_type
     
     # Check for required source files
     required_core_files = [
@@ -176,212 +463,128 @@ def validate_project_structure(source, target, env):
         ]
     }
     
-    missing_files = []
+    required_files = required_core_files + device_specific_files.get(device_type, [])
+    partition_file = f"partitions_{device_type}.csv"
     
-    # Check core files
-    for file_path in required_core_files:
-        if not os.path.exists(file_path):
-            missing_files.append(file_path)
+    # Group every existence check by directory; partition table and
+    # device config live in the project root
+    needed = {}
+    for file_path in required_files:
+        directory, name = os.path.split(file_path)
+        needed.setdefault(directory, set()).add(name)
+    needed.setdefault(".", set()).update((partition_file, "partitions.csv", "device_config.json"))
+    
+    # Skip validation when nothing it looks at changed since the last clean run
+    watched_paths = set(needed)
+    watched_paths.add("device_config.json")
+    if _validation_is_current(device_type, watched_paths):
+        _log(f"✓ Project structure unchanged since last validation ({device_type} device)")
+        return
+    
+    # Collect the report so it is printed as one block
+    report = []
+    
+    # One listing per directory answers all existence checks
+    present = {directory: _list_dir(directory) & names for directory, names in needed.items()}
+    
+    missing_files = [
+        file_path for file_path in required_files
+        if os.path.basename(file_path) not in present[os.path.dirname(file_path)]
+    ]
     
-    # Check device-specific files
-    if device_type in device_specific_files:
-        for file_path in device_specific_files[device_type]:
-            if not os.path.exists(file_path):
-                missing_files.append(file_path)
+    clean = not missing_files
     
     if missing_files:
-        print("WARNING: Missing required files:")
+        report.append("WARNING: Missing required files:")
         for file_path in missing_files:
-            print(f"  - {file_path}")
+            report.append(f"  - {file_path}")
     else:
-        print("✓ All required source files found")
+        report.append("✓ All required source files found")
+    
+    root_entries = present["."]
     
     # Validate partition table
-    partition_file = f"partitions_{device_type}.csv"
-    if os.path.exists(partition_file):
-        print(f"✓ Device-specific partition table found: {partition_file}")
-    elif os.path.exists("partitions.csv"):
-        print("✓ Generic partition table found")
+    if partition_file in root_entries:
+        report.append(f"✓ Device-specific partition table found: {partition_file}")
+    elif "partitions.csv" in root_entries:
+        report.append("✓ Generic partition table found")
     else:
-        print("WARNING: No partition table found")
+        report.append("WARNING: No partition table found")
+        clean = False
     
     # Validate configuration
-    if os.path.exists("device_config.json"):
+    if "device_config.json" in root_entries:
         try:
             with open("device_config.json", "r") as f:
                 config = json.load(f)
                 if config.get("device_type") == device_type:
-                    print("✓ Device configuration matches build target")
+                    report.append("✓ Device configuration matches build target")
                 else:
-                    print(f"WARNING: Device config type mismatch: {config.get('device_type')} != {device_type}")
+                    report.append(f"WARNING: Device config type mismatch: {config.get('device_type')} != {device_type}")
+                    clean = False
         except Exception as e:
-            print(f"WARNING: Could not validate device config: {e}")
+            report.append(f"WARNING: Could not validate device config: {e}")
+            clean = False
     
-    print(f"✓ Project validation complete for {device_type} device")
+    report.append(f"✓ Project validation complete for {device_type} device")
+    _log(*report)
+    
+    # Only a run without warnings may be skipped next time
+    if clean:
+        _atomic_write_bytes(_VALIDATION_STAMP, device_type.encode("ascii"))
 
-def create_version_file(source, target, env):
+def create_version_file(ctx):
     """Create version information file for runtime access"""
     
-    device_type = get_device_type()
-    
     version_info = {
         "firmware_version": "1.0.0",
-        "build_time": datetime.now().isoformat(),
-        "device_type": device_type,
-        "build_type": env.get('BUILD_TYPE', 'debug'),
-        "git_hash": "unknown",
-        "git_branch": "unknown"
+        "device_type": ctx.device_type,
+        "build_type": ctx.build_type,
+        "git_hash": ctx.git_info["hash"],
+        "git_branch": ctx.git_info["branch"]
     }
     
-    try:
-        import subprocess
-        version_info["git_hash"] = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD']).decode('ascii').strip()
-        version_info["git_branch"] = subprocess.check_output(['git', 'rev-parse', '--abbrev-ref', 'HEAD']).decode('ascii').strip()
-    except:
-        pass
-    
-    # Create data directory if it doesn't exist
-    os.makedirs("data", exist_ok=True)
+    # Write version file only when it changed, so the data image is not rebuilt.
+    # Build time is left out on purpose; it is available as BUILD_TIME in build_info.h.
+    if _write_if_changed("data/version.json", json.dumps(version_info, **_JSON_OPTIONS)):
+        _log(f"✓ Created version file: data/version.json")
+    else:
+        _log(f"✓ Version file unchanged: data/version.json")
+
+def generate_config_template(ctx):
+    """Generate device-specific configuration template"""
     
-    # Write version file
-    with open("data/version.json", "w") as f:         
-        json.dump(version_info, f, indent=2)
+    device_type = ctx.device_type
     
-    print(f"✓ Created version file: data/version.json")
+    if device_type in _CONFIG_TEMPLATE_JSON:
+        config_file = f"data/config_template_{device_type}.json"
+        if _write_if_changed(config_file, _CONFIG_TEMPLATE_JSON[device_type]):
+            _log(f"✓ Generated config template: {config_file}")
+        else:
+            _log(f"✓ Config template unchanged: {config_file}")
 
-def generate_config_template(source, target, env):
-    """Generate device-specific configuration template"""
+def _prebuild_all(source, target, env):
+    """Run all pre-build steps concurrently with a single shared context"""
     
-    device_type = get_device_type()
+    from concurrent.futures import ThreadPoolExecutor
     
-    templates = {
-        "environmental": {
-            "device": {
-                "type": "environmental",
-                "name": "AeroEnv Controller",
-                "version": "1.0.0"
-            },
-            "sensors": [
-                {
-                    "name": "sht3x",
-                    "type": "SHT3x", 
-                    "i2c_address": "0x44",
-                    "enabled": True
-                },
-                {
-                    "name": "pressure",
-                    "type": "AnalogPressure",
-                    "pin": 36,
-                    "enabled": True
-                }
-            ],
-            "actuators": [
-                {
-                    "name": "lights",
-                    "type": "Relay",
-                    "pin": 23,
-                    "enabled": True
-                },
-                {
-                    "name": "spray",
-                    "type": "VenturiNozzle", 
-                    "pin": 22,
-                    "enabled": True,
-                    "pulse_width_ms": 5000
-                }
-            ]
-        },
-        "liquid": {
-            "device": {
-                "type": "liquid",
-                "name": "AeroLiquid Controller",
-                "version": "1.0.0"
-            },
-            "sensors": [
-                {
-                    "name": "ph_sensor",
-                    "type": "AnalogPH",
-                    "pin": 36,
-                    "enabled": True
-                },
-                {
-                    "name": "ec_sensor", 
-                    "type": "AnalogEC",
-                    "pin": 39,
-                    "enabled": True
-                }
-            ],
-            "actuators": [
-                {
-                    "name": "ph_up_pump",
-                    "type": "PeristalticPump",
-                    "pin": 23,
-                    "enabled": True
-                },
-                {
-                    "name": "nutrient_pump",
-                    "type": "PeristalticPump", 
-                    "pin": 22,
-                    "enabled": True
-                }
-            ]
-        }
-    }
+    ctx = _Context(env)
+    _ensure_dirs(("include", "data"))
     
-    if device_type in templates:
-        os.makedirs("data", exist_ok=True)
-        
-        config_file = f"data/config_template_{device_type}.json"
-        with open(config_file, "w") as f:
-            json.dump(templates[device_type], f, indent=2)
-        
-        print(f"✓ Generated config template: {config_file}")
+    # Steps only read ctx and write disjoint outputs, so they can overlap their I/O
+    steps = (generate_build_info, validate_project_structure, create_version_file, generate_config_template)
+    with ThreadPoolExecutor(max_workers=len(steps)) as executor:
+        futures = [executor.submit(step, ctx) for step in steps]
+        for future in futures:
+            future.result()
 
 # Register build actions
-env.AddPreAction("buildprog", generate_build_info)
-env.AddPreAction("buildprog", validate_project_structure) 
-env.AddPreAction("buildprog", create_version_file)
-env.AddPreAction("buildprog", generate_config_template)
+env.AddPreAction("buildprog", _prebuild_all)
 
 print(f"Build script loaded for {get_device_type()} device")
 
 # Post-build actions for creating distribution packages
-def create_distribution_package(source, target, env):
-    """Create distribution package with firmware and documentation"""
-    
-    device_type = get_device_type()
-    build_type = env.get('BUILD_TYPE', 'debug')
-    
-    # Create distribution directory
-    dist_dir = f"dist/{device_type}_{build_type}"
-    os.makedirs(dist_dir, exist_ok=True)
-    
-    # Copy firmware binary
-    firmware_path = target[0].get_abspath()
-    if os.path.exists(firmware_path):
-        firmware_size = os.path.getsize(firmware_path)
-        dist_firmware = f"{dist_dir}/firmware.bin"
-        
-        import shutil
-        shutil.copy2(firmware_path, dist_firmware)
-        print(f"✓ Firmware copied: {dist_firmware} ({firmware_size:,} bytes)")
-    
-    # Copy partition table
-    partition_files = [f"partitions_{device_type}.csv", "partitions.csv"]
-    for partition_file in partition_files:
-        if os.path.exists(partition_file):
-            shutil.copy2(partition_file, f"{dist_dir}/partitions.csv")
-            print(f"✓ Partition table copied: {partition_file}")
-            break
-    
-    # Copy configuration template
-    config_template = f"data/config_template_{device_type}.json"
-    if os.path.exists(config_template):
-        shutil.copy2(config_template, f"{dist_dir}/default_config.json")
-        print(f"✓ Configuration template copied")
-    
-    # Create installation instructions
-    install_doc = f"""# {device_type.title()} Device Installation
+_INSTALL_DOC_TMPL = """# {device_title} Device Installation
 
 ## Files Included
 - `firmware.bin`: Main firmware binary
@@ -421,9 +624,50 @@ Device will create default configuration on first boot. Connect via serial at 11
 ## Support
 Check serial output for diagnostic information and error messages.
 """
+
+# Installation instructions only vary by device type, so render them once
+_INSTALL_DOC_BYTES = {
+    device_type: _INSTALL_DOC_TMPL.format(device_title=device_type.title()).encode("utf-8")
+    for device_type in _DEVICE_INFO
+}
+
+def create_distribution_package(source, target, env):
+    """Create distribution package with firmware and documentation"""
+    
+    import shutil
+    
+    device_type = get_device_type()
+    build_type = env.get('BUILD_TYPE', 'debug')
+    
+    # Create distribution directory
+    dist_dir = f"dist/{device_type}_{build_type}"
+    _ensure_dirs((dist_dir,))
+    
+    # Copy firmware binary
+    firmware_path = target[0].get_abspath()
+    if os.path.exists(firmware_path):
+        firmware_size = os.path.getsize(firmware_path)
+        dist_firmware = f"{dist_dir}/firmware.bin"
+        
+        shutil.copyfile(firmware_path, dist_firmware)
+        print(f"✓ Firmware copied: {dist_firmware} ({firmware_size:,} bytes)")
+    
+    # Copy partition table
+    partition_files = [f"partitions_{device_type}.csv", "partitions.csv"]
+    for partition_file in partition_files:
+        if os.path.exists(partition_file):
+            shutil.copyfile(partition_file, f"{dist_dir}/partitions.csv")
+            print(f"✓ Partition table copied: {partition_file}")
+            break
+    
+    # Copy configuration template
+    config_template = f"data/config_template_{device_type}.json"
+    if os.path.exists(config_template):
+        shutil.copyfile(config_template, f"{dist_dir}/default_config.json")
+        print(f"✓ Configuration template copied")
     
-    with open(f"{dist_dir}/INSTALL.md", "w") as f:
-        f.write(install_doc)
+    # Write installation instructions
+    _write_if_changed(f"{dist_dir}/INSTALL.md", _INSTALL_DOC_BYTES[device_type])
     
     print(f"✓ Distribution package created: {dist_dir}/")
 